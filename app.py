@@ -1,14 +1,107 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import io
 import json
 import math
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import queue
+import re
+import threading
 import numpy as np
-from PIL import Image, ImageDraw, ImageTk
 import os
 from datetime import datetime
 
+# Room length to width ratio, with its square roots precomputed
+_ROOM_RATIO = 1.4
+_SQRT_ROOM_RATIO = math.sqrt(_ROOM_RATIO)
+_INV_SQRT_ROOM_RATIO = 1.0 / _SQRT_ROOM_RATIO
+
+# Oldest chat lines are dropped beyond this so the Text widget stays small
+_CHAT_MAX_LINES = 800
+
+# Canned AI assistant responses, built once at import
+_RESP_BEAM = """For beam design, consider these guidelines:
+• For residential spans (8-15 ft): Use 9" × 12" beam
+• Depth = L/12 to L/15 for simply supported beams
+• Steel: 2-12mm bars top + 2-12mm bars bottom minimum
+• Stirrups: 8mm @ 150mm c/c as per IS 456:2000
+• For spans over 15ft: Consider deeper sections or intermediate supports"""
+
+_RESP_COLUMN = """Column design guidelines:
+• For loads up to 500kN: Use 12" × 12" column
+• Steel: 4-16mm dia bars minimum (0.8% steel)
+• Ties: 8mm @ 150mm c/c (IS 456:2000)
+• Concrete: M20 or M25 grade
+• Clear cover: 40mm for columns
+• Slenderness ratio should not exceed 60"""
+
+_RESP_SLAB = """Slab design specifications:
+• One-way slab: L/28 to L/35 thickness
+• Two-way slab: L/32 to L/40 thickness
+• Minimum thickness: 125mm (5 inches)
+• Steel: 10mm @ 150mm c/c both directions
+• Clear cover: 20mm for slabs
+• Concrete: M20 grade minimum"""
+
+_RESP_FOUNDATION = """Foundation design considerations:
+• Depth: Minimum 1.5m below ground level
+• Size: Based on soil bearing capacity (typically 10-20 T/m²)
+• For residential: 4' × 4' isolated footings
+• Steel: 12mm bars @ 150mm c/c both ways
+• Concrete: M20 grade
+• Always conduct soil test first!"""
+
+_RESP_COST = """Current construction cost estimates (₹/sq ft):
+• Basic construction: ₹1200-1500/sq ft
+• Good quality: ₹1500-2000/sq ft
+• Premium construction: ₹2000-3000/sq ft
+• Material cost: 60-65% of total
+• Labor cost: 25-30% of total
+• Other expenses: 10-15% of total
+Note: Rates vary by location and current market prices."""
+
+_RESP_CODES = """Important Indian Standards (IS Codes):
+• IS 456:2000 - RCC Design Code
+• IS 875:1987 - Design Loads (Dead, Live, Wind)
+• IS 1893:2016 - Seismic Design
+• IS 1904:1986 - Foundation Design
+• IS 2502:1963 - Bar Bending Schedule
+• IS 10262:2019 - Concrete Mix Design
+Always refer to latest versions!"""
+
+_RESP_LOAD = """Load calculations as per IS 875:
+• Dead Load: RCC = 25 kN/m³, Brick = 20 kN/m³
+• Live Load: Residential = 2 kN/m², Commercial = 3-5 kN/m²
+• Floor finish load = 1 kN/m²
+• Wall load = Height × thickness × 20 kN/m³
+• Total load = 1.5×DL + 1.5×LL (load factors)
+• Wind load: As per IS 875 Part-3"""
+
+_RESP_DEFAULT = """I can help you with structural engineering questions including:
+• Beam and column design
+• Load calculations
+• Foundation sizing
+• IS Code references
+• Material specifications
+• Cost estimation
+• Reinforcement details
+
+Please ask a specific question about any of these topics!"""
+
+# Lower-case words in a chat message
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+# Keyword sets checked in order; the first set sharing a word with the message wins
+_KEYWORD_TABLE = [
+    (frozenset({'beam', 'span'}), _RESP_BEAM),
+    (frozenset({'column'}), _RESP_COLUMN),
+    (frozenset({'slab'}), _RESP_SLAB),
+    (frozenset({'foundation'}), _RESP_FOUNDATION),
+    (frozenset({'cost', 'rate', 'price'}), _RESP_COST),
+    (frozenset({'standard', 'code'}), _RESP_CODES),  # also covers "is code"
+    (frozenset({'load'}), _RESP_LOAD),
+]
+
+
 class PlannifyProAI:
     """
     Plannify Pro AI - Complete Floor Planning Application
@@ -24,13 +117,30 @@ class PlannifyProAI:
         
         # Application state variables
         self.current_tab = 'draw_plot'
-        self.plot_points = []
+        self._pts = np.empty((16, 2), dtype=np.float64)  # plot vertices (x, y), grown by doubling
+        self._n = 0  # number of vertices in use
+        self._twice_signed_area = 0.0  # running shoelace sum over the closed polygon
+        self._area_cache = 0
+        self._area_dirty = True
         self.is_drawing = False
         self.scale = 10  # pixels per foot
+        self._scale_sq_inv = 0.5 / (self.scale * self.scale)  # twice-signed px area -> sq ft
         self.facing = 'north'
-        self.selected_rooms = set()
+        self.selected_rooms = {}  # insertion-ordered, keeps the layout stable
+        self.room_layout = []  # precomputed draw parameters per selected room
+        self.room_sprite_cache = {}  # (width, height, color, name, area) -> PhotoImage, LRU order
+        self.room_sprite_fonts = None
         self.room_sizes = {}
         
+        # Mouse-motion coalescing for the preview line
+        self._motion_pending = False
+        self._motion_xy = (0, 0)
+        self._last_motion = None
+        self._scale_pending = False
+        self._export_busy = False  # a floor plan export is running on a worker thread
+        self._chat_requests = queue.Queue()  # user messages awaiting an AI response
+        self._chat_worker = None
+        
         # Room definitions with Vastu-based colors and size ranges
         self.room_definitions = {
             'master_bedroom': {'name': 'Master Bedroom', 'min_size': 200, 'max_size': 400, 'default_size': 250, 'color': '#8b5cf6'},
@@ -45,13 +155,28 @@ class PlannifyProAI:
             'store_room': {'name': 'Store Room', 'min_size': 40, 'max_size': 100, 'default_size': 50, 'color': '#6b7280'}
         }
         
+        # Precompute per-room drawing styles so floor plan drawing does no string work
+        self.room_styles = {}
+        for room_key, room_data in self.room_definitions.items():
+            room_data['fill_color'] = room_data['color'] + '40'  # Add transparency
+            self.room_styles[room_key] = (room_data['name'], room_data['color'], room_data['fill_color'])
+        
         # Canvas dimensions
         self.canvas_width = 600
         self.canvas_height = 400
         
+        # Mapping from plot canvas to floor plan canvas coordinates
+        self.floor_plan_scale = min(800, 600) / max(self.canvas_width, self.canvas_height)
+        self.floor_plan_offset = np.array([50.0, 50.0])
+        
         # Initialize the application
         self.init_app()
     
+    @property
+    def plot_points(self):
+        """Current plot vertices as an (n, 2) array view"""
+        return self._pts[:self._n]
+    
     def init_app(self):
         """Initialize the application components"""
         self.setup_ui()
@@ -75,6 +200,10 @@ class PlannifyProAI:
         self.create_beam_calculator_tab()
         self.create_ai_chat_tab()
         
+        # Grid never changes, so draw it once
+        self._init_static_grid()
+        self.redraw_canvas()
+        
         # Create status bar
         self.create_status_bar()
     
@@ -121,15 +250,18 @@ class PlannifyProAI:
         info_frame.pack(fill=tk.X)
         
         ttk.Label(info_frame, text="Vertices:").grid(row=0, column=0, sticky=tk.W)
-        self.vertex_count_label = ttk.Label(info_frame, text="0")
+        self.vertex_count_var = tk.StringVar(value="0")
+        self.vertex_count_label = ttk.Label(info_frame, textvariable=self.vertex_count_var)
         self.vertex_count_label.grid(row=0, column=1)
         
         ttk.Label(info_frame, text="Total Area:").grid(row=1, column=0, sticky=tk.W)
-        self.total_area_label = ttk.Label(info_frame, text="0 sq ft")
+        self.total_area_var = tk.StringVar(value="0 sq ft")
+        self.total_area_label = ttk.Label(info_frame, textvariable=self.total_area_var)
         self.total_area_label.grid(row=1, column=1)
         
         ttk.Label(info_frame, text="Built-up Area:").grid(row=2, column=0, sticky=tk.W)
-        self.builtup_area_label = ttk.Label(info_frame, text="0 sq ft")
+        self.builtup_area_var = tk.StringVar(value="0 sq ft")
+        self.builtup_area_label = ttk.Label(info_frame, textvariable=self.builtup_area_var)
         self.builtup_area_label.grid(row=2, column=1)
         
         # Canvas for drawing
@@ -270,6 +402,11 @@ class PlannifyProAI:
         self.beam_load_var = tk.DoubleVar(value=10.0)
         ttk.Entry(input_frame, textvariable=self.beam_load_var).grid(row=2, column=1, padx=5, pady=5)
         
+        # Mirror inputs into plain attributes so calculations don't round-trip through Tcl
+        self.cache_var_value(self.beam_type_var, '_beam_type')
+        self.cache_var_value(self.beam_length_var, '_beam_length')
+        self.cache_var_value(self.beam_load_var, '_beam_load')
+        
         # Calculate button
         ttk.Button(input_frame, text="Calculate", command=self.calculate_beam).grid(row=3, column=0, columnspan=2, pady=10)
         
@@ -285,33 +422,92 @@ class PlannifyProAI:
         self.max_shear_label = ttk.Label(results_frame, text="0 kN")
         self.max_shear_label.grid(row=1, column=1, padx=5, pady=5)
         
-        # Diagrams frame
-        diagrams_frame = ttk.Frame(beam_frame)
-        diagrams_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Create matplotlib figures for diagrams
-        self.create_beam_diagrams(diagrams_frame)
+        # Diagrams frame; the matplotlib figure is created on the first calculation
+        self.beam_diagrams_frame = ttk.Frame(beam_frame)
+        self.beam_diagrams_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.beam_fig = None
+        self._beam_unit_x = np.linspace(0, 1, 100)  # sample positions along a unit span
+        self._beam_x = np.empty(100)  # sample positions, refilled in place when the length changes
+        self._beam_x_length = None
+        self._last_beam_key = None  # (beam_type, length, load) of the last completed analysis
+        self._beam_shear = np.empty(100)  # diagram buffers filled in place on each calculation
+        self._beam_moment = np.empty(100)
+    
+    def cache_var_value(self, var, attr):
+        """Keep attr in sync with a Tk variable; None while its text isn't a valid value"""
+        def update(*args):
+            try:
+                setattr(self, attr, var.get())
+            except tk.TclError:
+                setattr(self, attr, None)
+        
+        var.trace_add('write', update)
+        update()
     
-    def create_beam_diagrams(self, parent):
-        """Create matplotlib figures for beam diagrams"""
+    def _ensure_beam_figure(self):
+        """Create matplotlib figures for beam diagrams on first use"""
+        if self.beam_fig is not None:
+            return
+        
+        # Imported here so startup doesn't pay for matplotlib until it's needed
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.collections import PolyCollection
+        
         # Create figure with subplots
         self.beam_fig, (self.sfd_ax, self.bmd_ax) = plt.subplots(2, 1, figsize=(8, 6))
         self.beam_fig.suptitle('Shear Force and Bending Moment Diagrams')
         
-        # Configure axes
+        # Configure axes; curves are persistent, animated artists blitted over a cached background
+        self._sfd_line, = self.sfd_ax.plot([], [], 'r-', linewidth=2, label='Shear Force', animated=True)
+        self.sfd_ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
         self.sfd_ax.set_title('Shear Force Diagram')
         self.sfd_ax.set_ylabel('Shear Force (kN)')
         self.sfd_ax.grid(True, alpha=0.3)
+        self.sfd_ax.legend()
         
+        self._bmd_line, = self.bmd_ax.plot([], [], 'b-', linewidth=2, label='Bending Moment', animated=True)
+        self.bmd_ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
         self.bmd_ax.set_title('Bending Moment Diagram')
         self.bmd_ax.set_xlabel('Distance (ft)')
         self.bmd_ax.set_ylabel('Bending Moment (kN-m)')
         self.bmd_ax.grid(True, alpha=0.3)
+        self.bmd_ax.legend()
+        
+        # Persistent fills between each curve and zero; only their vertices change
+        self._sfd_fill = PolyCollection([], color='red', alpha=0.3, animated=True)
+        self._bmd_fill = PolyCollection([], color='blue', alpha=0.3, animated=True)
+        self.sfd_ax.add_collection(self._sfd_fill, autolim=False)
+        self.bmd_ax.add_collection(self._bmd_fill, autolim=False)
+        self._sfd_fill_verts = np.empty((len(self._beam_shear) + 2, 2))
+        self._bmd_fill_verts = np.empty((len(self._beam_moment) + 2, 2))
+        self._beam_background = None
         
         # Embed in tkinter
-        self.beam_canvas = FigureCanvasTkAgg(self.beam_fig, parent)
-        self.beam_canvas.draw()
+        self.beam_canvas = FigureCanvasTkAgg(self.beam_fig, self.beam_diagrams_frame)
         self.beam_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.beam_canvas.mpl_connect('draw_event', self.on_beam_canvas_draw)
+    
+    def on_beam_canvas_draw(self, event):
+        """Cache the static background after a full draw and paint the curves over it"""
+        self._beam_background = self.beam_canvas.copy_from_bbox(self.beam_fig.bbox)
+        self.draw_beam_curves()
+    
+    def draw_beam_curves(self):
+        """Draw the animated curve and fill artists onto the canvas buffer"""
+        for ax, artists in ((self.sfd_ax, (self._sfd_fill, self._sfd_line)),
+                            (self.bmd_ax, (self._bmd_fill, self._bmd_line))):
+            for artist in artists:
+                ax.draw_artist(artist)
+    
+    def update_beam_fill(self, fill, verts, x, y):
+        """Reshape a persistent fill to cover the area between a curve and zero"""
+        n = len(x)
+        verts[:n, 0] = x
+        verts[:n, 1] = y
+        verts[n] = (x[-1], 0.0)
+        verts[n + 1] = (x[0], 0.0)
+        fill.set_verts([verts])
     
     def create_ai_chat_tab(self):
         """Create the AI chat assistant tab"""
@@ -327,6 +523,12 @@ class PlannifyProAI:
         chat_scrollbar = ttk.Scrollbar(chat_display_frame, command=self.chat_text.yview)
         self.chat_text.configure(yscrollcommand=chat_scrollbar.set)
         
+        # Configure text tags for styling once; messages only reference them
+        self.chat_text.tag_configure("user_label", foreground="blue", font=('Arial', 10, 'bold'))
+        self.chat_text.tag_configure("ai_label", foreground="green", font=('Arial', 10, 'bold'))
+        self.chat_text.tag_configure("user_message", font=('Arial', 10))
+        self.chat_text.tag_configure("ai_message", font=('Arial', 10))
+        
         self.chat_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         chat_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
@@ -381,155 +583,303 @@ class PlannifyProAI:
     
     def on_canvas_motion(self, event):
         """Handle canvas mouse motion for preview line"""
-        if self.is_drawing and self.plot_points:
-            self.show_preview_line(event.x, event.y)
+        if self.is_drawing and self._n:
+            # Ignore events that land on the same pixel as the last one
+            xy = (event.x, event.y)
+            if xy == self._last_motion:
+                return
+            self._last_motion = xy
+            
+            # Keep only the latest position and redraw at most once per frame (~60 fps)
+            self._motion_xy = xy
+            if not self._motion_pending:
+                self._motion_pending = True
+                self.root.after(16, self._flush_motion)
+    
+    def _flush_motion(self):
+        """Draw the preview line for the most recent mouse position"""
+        self._motion_pending = False
+        if self.is_drawing:
+            self.show_preview_line(*self._motion_xy)
     
     def add_plot_point(self, x, y):
         """Add a point to the plot"""
-        self.plot_points.append({'x': x, 'y': y})
-        self.redraw_canvas()
+        if self._n == len(self._pts):
+            self._pts = np.resize(self._pts, (2 * len(self._pts), 2))
+        self._pts[self._n] = (x, y)
+        self._n += 1
+        self._twice_signed_area += self.last_vertex_area_delta()
+        self._area_dirty = True
+        
+        # Only the new vertex, its edge and the closing edge change
+        self.add_vertex_items(self._n - 1)
+        self.update_closing_items()
+        self.raise_overlay_items()
+        
+        # The preview ended at the clicked pixel; redraw it from the new vertex on the next motion
+        self.plot_canvas.delete('preview')
+        self._last_motion = None
+        
         self.update_plot_info()
-        self.status_var.set(f"Added point {len(self.plot_points)}")
+        self.status_var.set(f"Added point {self._n}")
     
     def clear_plot(self):
         """Clear all plot points"""
-        self.plot_points = []
+        self._n = 0
+        self._twice_signed_area = 0.0
+        self._area_dirty = True
         self.redraw_canvas()
         self.update_plot_info()
         self.status_var.set("Plot cleared")
     
     def undo_last_point(self):
         """Undo the last plot point"""
-        if self.plot_points:
-            self.plot_points.pop()
-            self.redraw_canvas()
+        if self._n:
+            self._twice_signed_area -= self.last_vertex_area_delta()
+            self._n -= 1
+            self._area_dirty = True
+            
+            self.plot_canvas.delete(self._point_ids.pop())
+            if self._edge_ids:
+                self.plot_canvas.delete(self._edge_ids.pop())
+                self.plot_canvas.delete(self._measure_ids.pop())
+            self.update_closing_items()
+            
+            # The preview started at the removed vertex; redraw it on the next motion
+            self.plot_canvas.delete('preview')
+            self._last_motion = None
+            
             self.update_plot_info()
             self.status_var.set("Last point removed")
     
     def show_preview_line(self, mouse_x, mouse_y):
         """Show preview line while drawing"""
-        if not self.plot_points:
+        if not self._n:
             return
         
-        self.redraw_canvas()
+        self.plot_canvas.delete('preview')
         
-        last_point = self.plot_points[-1]
-        self.plot_canvas.create_line(last_point['x'], last_point['y'], mouse_x, mouse_y,
+        last_x, last_y = self._pts[self._n - 1]
+        self.plot_canvas.create_line(last_x, last_y, mouse_x, mouse_y,
                                    fill='gray', dash=(5, 5), tags='preview')
     
     def redraw_canvas(self):
         """Redraw the canvas with current plot"""
-        self.plot_canvas.delete("all")
-        self.draw_grid()
-        
-        if not self.plot_points:
+        for tag in ('plot', 'plot_fill', 'points', 'measurements', 'preview'):
+            self.plot_canvas.delete(tag)
+        
+        # Canvas item IDs, kept so single-point edits don't need a full redraw
+        self._point_ids = []
+        self._edge_ids = []  # edge i joins vertex i to vertex i+1
+        self._measure_ids = []  # one label per entry in _edge_ids
+        
+        # Closing edge, its label and the fill are created once, hidden, and only
+        # moved with coords() or shown/hidden from then on
+        self._fill_id = self.plot_canvas.create_polygon(0, 0, 0, 0, 0, 0, fill='lightblue',
+                                                       outline='blue', width=3, stipple='gray25',
+                                                       state=tk.HIDDEN, tags=('plot_fill', 'closing'))
+        self._close_edge_id = self.plot_canvas.create_line(0, 0, 0, 0, fill='blue', width=3,
+                                                          state=tk.HIDDEN, tags=('plot', 'closing'))
+        self._close_measure_id = self.plot_canvas.create_text(0, 0, text='', fill='orange',
+                                                             font=('Arial', 9, 'bold'), state=tk.HIDDEN,
+                                                             tags=('measurements', 'closing'))
+        self._closing_visible = False
+        
+        if not self._n:
             return
         
-        # Draw plot lines
-        if len(self.plot_points) > 1:
-            points = []
-            for point in self.plot_points:
-                points.extend([point['x'], point['y']])
-            
-            self.plot_canvas.create_line(points, fill='blue', width=3, tags='plot')
-            
-            # Close polygon if we have at least 3 points
-            if len(self.plot_points) >= 3:
-                self.plot_canvas.create_line(
-                    self.plot_points[-1]['x'], self.plot_points[-1]['y'],
-                    self.plot_points[0]['x'], self.plot_points[0]['y'],
-                    fill='blue', width=3, tags='plot'
-                )
-                
-                # Fill polygon
-                fill_points = []
-                for point in self.plot_points:
-                    fill_points.extend([point['x'], point['y']])
-                
-                self.plot_canvas.create_polygon(fill_points, fill='lightblue', 
-                                              outline='blue', width=3, stipple='gray25', tags='plot_fill')
-        
-        # Draw points
-        for i, point in enumerate(self.plot_points):
-            self.plot_canvas.create_oval(point['x']-4, point['y']-4, 
-                                       point['x']+4, point['y']+4,
-                                       fill='darkblue', tags='points')
-            
-            # Draw measurements
-            if i > 0:
-                self.draw_measurement(self.plot_points[i-1], point)
+        for i in range(self._n):
+            self.add_vertex_items(i, measure=False)
         
-        # Draw closing measurement
-        if len(self.plot_points) >= 3:
-            self.draw_measurement(self.plot_points[-1], self.plot_points[0])
+        # Label the open edges from one batched length computation
+        label_x, label_y, feet = self.edge_measurements()
+        for i in range(self._n - 1):
+            self._measure_ids.append(self.create_measurement_item(label_x[i], label_y[i], f"{feet[i]}'"))
+        self.update_closing_items()
+        self.raise_overlay_items()
     
-    def draw_grid(self):
-        """Draw grid on canvas"""
+    def _init_static_grid(self):
+        """Draw grid on canvas once as a single image; redraws leave it in place"""
+        from PIL import Image, ImageDraw, ImageTk
+        
         grid_size = 20
+        grid_image = Image.new('RGB', (self.canvas_width, self.canvas_height), 'white')
+        draw = ImageDraw.Draw(grid_image)
         
         # Vertical lines
         for x in range(0, self.canvas_width, grid_size):
-            self.plot_canvas.create_line(x, 0, x, self.canvas_height, 
-                                       fill='lightgray', tags='grid')
+            draw.line((x, 0, x, self.canvas_height), fill='lightgray')
         
         # Horizontal lines
         for y in range(0, self.canvas_height, grid_size):
-            self.plot_canvas.create_line(0, y, self.canvas_width, y, 
-                                       fill='lightgray', tags='grid')
+            draw.line((0, y, self.canvas_width, y), fill='lightgray')
+        
+        # Keep a reference so Tk doesn't lose the image to garbage collection
+        self._grid_photo = ImageTk.PhotoImage(grid_image)
+        self.plot_canvas.create_image(0, 0, image=self._grid_photo, anchor=tk.NW, tags='grid')
     
-    def draw_measurement(self, point1, point2):
-        """Draw measurement between two points"""
-        distance = math.sqrt((point2['x'] - point1['x'])**2 + (point2['y'] - point1['y'])**2)
-        feet = round(distance / self.scale, 1)
+    def add_vertex_items(self, i, measure=True):
+        """Create the marker for vertex i and the edge joining it to vertex i-1"""
+        x, y = self._pts[i]
+        self._point_ids.append(self.plot_canvas.create_oval(x-4, y-4, x+4, y+4,
+                                                           fill='darkblue', tags='points'))
+        
+        if i > 0:
+            prev_x, prev_y = self._pts[i-1]
+            self._edge_ids.append(self.plot_canvas.create_line(prev_x, prev_y, x, y,
+                                                              fill='blue', width=3, tags='plot'))
+            if measure:
+                self._measure_ids.append(self.draw_measurement(self._pts[i-1], self._pts[i]))
+    
+    def update_closing_items(self):
+        """Move, show or hide the closing edge, its label and the fill polygon"""
+        n = self._n
+        
+        if n < 3:
+            if self._closing_visible:
+                self.plot_canvas.itemconfigure('closing', state=tk.HIDDEN)
+                self._closing_visible = False
+            return
+        
+        pts = self._pts[:n]
+        first_x, first_y = pts[0]
+        last_x, last_y = pts[-1]
         
-        mid_x = (point1['x'] + point2['x']) / 2
-        mid_y = (point1['y'] + point2['y']) / 2
+        self.plot_canvas.coords(self._fill_id, pts.ravel().tolist())
+        self.plot_canvas.coords(self._close_edge_id, last_x, last_y, first_x, first_y)
+        self.update_measurement(self._close_measure_id, pts[-1], pts[0])
         
-        self.plot_canvas.create_text(mid_x, mid_y-10, text=f"{feet}'", 
-                                   fill='orange', font=('Arial', 9, 'bold'), tags='measurements')
+        if not self._closing_visible:
+            self.plot_canvas.itemconfigure('closing', state=tk.NORMAL)
+            self._closing_visible = True
+    
+    def raise_overlay_items(self):
+        """Keep vertex markers and labels above newly created edges"""
+        self.plot_canvas.tag_raise('points')
+        self.plot_canvas.tag_raise('measurements')
+        self.plot_canvas.tag_raise('preview')
+    
+    def edge_length_feet(self, dx, dy):
+        """Return an edge length in feet, using the same NumPy rounding as edge_measurements"""
+        return float(np.round(np.hypot(dx, dy) / self.scale, 1))
+    
+    def measurement_label(self, point1, point2):
+        """Return label position and text for the edge between two points"""
+        feet = self.edge_length_feet(point2[0] - point1[0], point2[1] - point1[1])
+        
+        mid_x = (point1[0] + point2[0]) / 2
+        mid_y = (point1[1] + point2[1]) / 2
+        
+        return mid_x, mid_y-10, f"{feet}'"
+    
+    def edge_measurements(self):
+        """Return label x, label y and length in feet for every edge, closing edge last"""
+        pts = self._pts[:self._n]
+        nxt = np.roll(pts, -1, axis=0)
+        
+        delta = nxt - pts
+        feet = np.round(np.hypot(delta[:, 0], delta[:, 1]) / self.scale, 1)
+        mid = (pts + nxt) / 2
+        
+        return mid[:, 0].tolist(), (mid[:, 1] - 10).tolist(), feet.tolist()
+    
+    def create_measurement_item(self, x, y, text):
+        """Create a measurement label and return its canvas item ID"""
+        return self.plot_canvas.create_text(x, y, text=text, 
+                                          fill='orange', font=('Arial', 9, 'bold'), tags='measurements')
+    
+    def draw_measurement(self, point1, point2):
+        """Draw measurement between two points and return its canvas item ID"""
+        return self.create_measurement_item(*self.measurement_label(point1, point2))
+    
+    def update_measurement(self, item_id, point1, point2):
+        """Move and relabel an existing measurement item"""
+        x, y, text = self.measurement_label(point1, point2)
+        self.plot_canvas.coords(item_id, x, y)
+        self.plot_canvas.itemconfigure(item_id, text=text)
+    
+    def refresh_measurements(self):
+        """Relabel every measurement in place (e.g. after a scale change)"""
+        if self._n < 2:
+            return
+        
+        # Positions are unchanged; only the lengths in feet need relabelling
+        _, _, feet = self.edge_measurements()
+        for item_id, length in zip(self._measure_ids, feet):
+            self.plot_canvas.itemconfigure(item_id, text=f"{length}'")
+        if self._closing_visible:
+            self.plot_canvas.itemconfigure(self._close_measure_id, text=f"{feet[-1]}'")
+    
+    def last_vertex_area_delta(self):
+        """Shoelace change from appending the last vertex: two new edges replace the old closing edge"""
+        if self._n < 2:
+            return 0.0
+        
+        first_x, first_y = self._pts[0]
+        prev_x, prev_y = self._pts[self._n - 2]
+        new_x, new_y = self._pts[self._n - 1]
+        
+        return ((prev_x * new_y - new_x * prev_y)
+                + (new_x * first_y - first_x * new_y)
+                - (prev_x * first_y - first_x * prev_y))
     
     def calculate_area(self):
         """Calculate plot area using shoelace formula"""
-        if len(self.plot_points) < 3:
-            return 0
+        if not self._area_dirty:
+            return self._area_cache
         
-        area = 0
-        n = len(self.plot_points)
-        
-        for i in range(n):
-            j = (i + 1) % n
-            area += self.plot_points[i]['x'] * self.plot_points[j]['y']
-            area -= self.plot_points[j]['x'] * self.plot_points[i]['y']
+        if self._n < 3:
+            area = 0
+        else:
+            area = int(abs(self._twice_signed_area) * self._scale_sq_inv + 0.5)
         
-        area = abs(area) / 2
-        return round(area / (self.scale * self.scale))
+        self._area_cache = area
+        self._area_dirty = False
+        return area
     
     def update_plot_info(self):
         """Update plot information display"""
         area = self.calculate_area()
-        builtup_area = round(area * 0.75)
+        builtup_area = (area * 3 + 2) >> 2  # 75% of area, rounded half up
         
-        self.vertex_count_label.configure(text=str(len(self.plot_points)))
-        self.total_area_label.configure(text=f"{area} sq ft")
-        self.builtup_area_label.configure(text=f"{builtup_area} sq ft")
+        self.vertex_count_var.set(str(self._n))
+        self.total_area_var.set(f"{area} sq ft")
+        self.builtup_area_var.set(f"{builtup_area} sq ft")
     
     def on_scale_change(self, value):
         """Handle scale slider change"""
-        self.scale = int(float(value))
+        scale = int(float(value))
+        if scale == self.scale:
+            return
+        
+        self.scale = scale
+        self._scale_sq_inv = 0.5 / (scale * scale)
+        self._area_dirty = True
         self.scale_label.configure(text=f"Scale: {self.scale}")
-        self.redraw_canvas()
+        
+        # Coalesce slider drags into one relabel of the plot
+        if not self._scale_pending:
+            self._scale_pending = True
+            self.root.after(50, self._flush_scale_change)
+    
+    def _flush_scale_change(self):
+        """Relabel measurements and area for the current scale"""
+        self._scale_pending = False
+        self.refresh_measurements()
         self.update_plot_info()
     
     def toggle_room_selection(self, room_key):
         """Toggle room selection and create/remove sliders"""
         if self.room_vars[room_key].get():
-            self.selected_rooms.add(room_key)
+            self.selected_rooms[room_key] = True
             self.room_sizes[room_key] = self.room_definitions[room_key]['default_size']
             self.create_room_slider(room_key)
         else:
-            self.selected_rooms.discard(room_key)
+            self.selected_rooms.pop(room_key, None)
             self.room_sizes.pop(room_key, None)
             self.remove_room_slider(room_key)
+        
+        self.update_room_layout()
     
     def create_room_slider(self, room_key):
         """Create slider for room size adjustment"""
@@ -579,7 +929,7 @@ class PlannifyProAI:
     
     def generate_floor_plan(self):
         """Generate floor plan"""
-        if len(self.plot_points) < 3:
+        if self._n < 3:
             messagebox.showerror("Error", "Please draw a plot with at least 3 points first.")
             return
         
@@ -602,17 +952,11 @@ class PlannifyProAI:
         self.floor_plan_canvas.delete("all")
         
         # Draw plot boundary
-        if len(self.plot_points) >= 3:
-            scale_factor = min(800, 600) / max(self.canvas_width, self.canvas_height)
-            offset_x = 50
-            offset_y = 50
-            
-            # Scale and translate points
-            scaled_points = []
-            for point in self.plot_points:
-                x = point['x'] * scale_factor + offset_x
-                y = point['y'] * scale_factor + offset_y
-                scaled_points.extend([x, y])
+        if self._n >= 3:
+            # Scale and translate points in one temporary array
+            scaled = self.plot_points * self.floor_plan_scale
+            scaled += self.floor_plan_offset
+            scaled_points = scaled.ravel().tolist()
             
             # Draw plot boundary
             self.floor_plan_canvas.create_polygon(scaled_points, fill='#f9fafb', 
@@ -624,9 +968,10 @@ class PlannifyProAI:
             # Draw compass
             self.draw_compass()
     
-    def draw_rooms_layout(self):
-        """Draw simplified rooms layout"""
-        rooms = list(self.selected_rooms)
+    def update_room_layout(self):
+        """Precompute the simplified rooms layout for the current selection"""
+        rooms = self.selected_rooms
+        self.room_layout = []
         if not rooms:
             return
         
@@ -638,26 +983,67 @@ class PlannifyProAI:
         start_y = 100
         
         for i, room_key in enumerate(rooms):
-            room_data = self.room_definitions[room_key]
+            name, color, fill_color = self.room_styles[room_key]
             col = i % grid_cols
             row = i // grid_cols
             
             x = start_x + col * (room_width + 20)
             y = start_y + row * (room_height + 20)
             
-            # Draw room rectangle
-            self.floor_plan_canvas.create_rectangle(x, y, x+room_width, y+room_height,
-                                                  fill=room_data['color'] + '40',  # Add transparency
-                                                  outline=room_data['color'], width=2)
-            
-            # Draw room label
-            self.floor_plan_canvas.create_text(x + room_width/2, y + room_height/2,
-                                             text=room_data['name'], font=('Arial', 10, 'bold'))
-            
-            # Draw area
-            self.floor_plan_canvas.create_text(x + room_width/2, y + room_height/2 + 15,
-                                             text=f"{self.room_sizes[room_key]} sq ft", 
-                                             font=('Arial', 9))
+            self.room_layout.append((room_key, x, y, room_width, room_height,
+                                     name, color, fill_color))
+    
+    def draw_rooms_layout(self):
+        """Draw simplified rooms layout"""
+        canvas = self.floor_plan_canvas
+        room_sizes = self.room_sizes
+        
+        # One pre-rendered image per room instead of a rectangle and two texts
+        for room_key, x, y, width, height, name, color, fill_color in self.room_layout:
+            sprite = self.get_room_sprite(width, height, name, color, fill_color, room_sizes[room_key])
+            canvas.create_image(x, y, image=sprite, anchor=tk.NW)
+    
+    def get_room_sprite(self, width, height, name, color, fill_color, area):
+        """Return a cached image of a room rectangle with its name and area"""
+        key = (width, height, color, name, area)
+        cache = self.room_sprite_cache
+        
+        sprite = cache.pop(key, None)
+        if sprite is None:
+            sprite = self.render_room_sprite(width, height, name, color, fill_color, area)
+            if len(cache) >= 64:
+                del cache[next(iter(cache))]  # drop least recently used
+        
+        # Re-inserting keeps the dict in LRU order and the image referenced
+        cache[key] = sprite
+        return sprite
+    
+    def render_room_sprite(self, width, height, name, color, fill_color, area):
+        """Render a room rectangle with its name and area to a PhotoImage"""
+        from PIL import Image, ImageDraw, ImageFont, ImageTk
+        
+        if self.room_sprite_fonts is None:
+            try:
+                self.room_sprite_fonts = (ImageFont.truetype('arialbd.ttf', 13),
+                                          ImageFont.truetype('arial.ttf', 12))
+            except OSError:
+                self.room_sprite_fonts = (ImageFont.load_default(), ImageFont.load_default())
+        name_font, area_font = self.room_sprite_fonts
+        
+        image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        
+        # Room rectangle; fill_color carries the alpha channel
+        draw.rectangle((0, 0, width - 1, height - 1), fill=fill_color, outline=color, width=2)
+        
+        # Room label and area, centred like the canvas text items they replace
+        for text, font, center_y in ((name, name_font, height / 2),
+                                     (f"{area} sq ft", area_font, height / 2 + 15)):
+            left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+            draw.text(((width - (right - left)) / 2 - left, center_y - (bottom - top) / 2 - top),
+                      text, fill='black', font=font)
+        
+        return ImageTk.PhotoImage(image)
     
     def draw_compass(self):
         """Draw compass on floor plan"""
@@ -682,45 +1068,58 @@ class PlannifyProAI:
     
     def generate_room_schedule(self):
         """Generate room schedule table"""
-        # Clear existing items
-        for item in self.room_schedule_tree.get_children():
-            self.room_schedule_tree.delete(item)
+        tree = self.room_schedule_tree
         
-        # Add room data
+        # Build all rows before touching the widget
+        rows = []
         for room_key in self.selected_rooms:
             room_data = self.room_definitions[room_key]
             area = self.room_sizes[room_key]
             dimensions = self.calculate_room_dimensions(area)
             
-            self.room_schedule_tree.insert('', tk.END, values=(
+            rows.append((
                 room_data['name'],
                 f"{area}",
                 f"{dimensions['length']}' × {dimensions['width']}'",
                 "10'"
             ))
+        
+        # Clear existing items in one call
+        tree.delete(*tree.get_children())
+        
+        # Hide columns while inserting so rows aren't laid out one by one
+        tree.configure(displaycolumns=())
+        for values in rows:
+            tree.insert('', tk.END, values=values)
+        tree.configure(displaycolumns='#all')
     
     def calculate_room_dimensions(self, area):
         """Calculate room dimensions based on area"""
-        ratio = 1.4  # length to width ratio
-        width = math.sqrt(area / ratio)
-        length = area / width
+        # width = sqrt(area / ratio) and length = area / width, both from one sqrt
+        root = math.sqrt(area)
         
         return {
-            'length': round(length),
-            'width': round(width)
+            'length': int(root * _SQRT_ROOM_RATIO + 0.5),
+            'width': int(root * _INV_SQRT_ROOM_RATIO + 0.5)
         }
     
     def calculate_beam(self):
         """Calculate beam analysis"""
         try:
-            beam_type = self.beam_type_var.get()
-            length = self.beam_length_var.get()
-            load = self.beam_load_var.get()
+            beam_type = self._beam_type
+            length = self._beam_length
+            load = self._beam_load
             
-            if length <= 0 or load <= 0:
+            if length is None or load is None or length <= 0 or load <= 0:
                 messagebox.showerror("Error", "Please enter valid positive values.")
                 return
             
+            # Results and diagrams are already showing for identical inputs
+            key = (beam_type, length, load)
+            if key == self._last_beam_key:
+                self.status_var.set("Beam analysis unchanged")
+                return
+            
             # Calculate based on beam type
             if beam_type == "simply_supported":
                 max_moment = (load * length**2) / 8
@@ -739,7 +1138,9 @@ class PlannifyProAI:
             self.max_shear_label.configure(text=f"{max_shear:.2f} kN")
             
             # Draw diagrams
+            self._ensure_beam_figure()
             self.draw_beam_diagrams(beam_type, length, load)
+            self._last_beam_key = key
             
             self.status_var.set("Beam analysis completed")
             
@@ -748,58 +1149,48 @@ class PlannifyProAI:
     
     def draw_beam_diagrams(self, beam_type, length, load):
         """Draw shear force and bending moment diagrams"""
-        # Clear previous plots
-        self.sfd_ax.clear()
-        self.bmd_ax.clear()
-        
         # Create x array
-        x = np.linspace(0, length, 100)
+        if self._beam_x_length != length:
+            np.multiply(self._beam_unit_x, length, out=self._beam_x)
+            self._beam_x_length = length
+        x = self._beam_x
         
         # Calculate shear force and bending moment
-        if beam_type == "simply_supported":
-            # Shear force (triangular)
-            shear = np.where(x <= length/2, 
-                           (load * length) / 2 - load * x,
-                           -(load * length) / 2 + load * (length - x))
-            
-            # Bending moment (parabolic)
-            moment = np.where(x <= length/2,
-                            (load * x / 2) * (length - x),
-                            (load * (length - x) / 2) * x)
-            
-        elif beam_type == "cantilever":
-            # Shear force (linear)
-            shear = -load * (length - x)
-            
-            # Bending moment (parabolic)
-            moment = -(load * (length - x)**2) / 2
-            
-        elif beam_type == "fixed_both":
-            # Simplified - actual would need more complex analysis
-            shear = (load * length) / 2 - load * x
-            moment = (load * x / 12) * (length**2 - x**2)
-        
-        # Plot SFD
-        self.sfd_ax.plot(x, shear, 'r-', linewidth=2, label='Shear Force')
-        self.sfd_ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        self.sfd_ax.fill_between(x, shear, alpha=0.3, color='red')
-        self.sfd_ax.set_title('Shear Force Diagram')
-        self.sfd_ax.set_ylabel('Shear Force (kN)')
-        self.sfd_ax.grid(True, alpha=0.3)
-        self.sfd_ax.legend()
-        
-        # Plot BMD
-        self.bmd_ax.plot(x, moment, 'b-', linewidth=2, label='Bending Moment')
-        self.bmd_ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        self.bmd_ax.fill_between(x, moment, alpha=0.3, color='blue')
-        self.bmd_ax.set_title('Bending Moment Diagram')
-        self.bmd_ax.set_xlabel('Distance (ft)')
-        self.bmd_ax.set_ylabel('Bending Moment (kN-m)')
-        self.bmd_ax.grid(True, alpha=0.3)
-        self.bmd_ax.legend()
-        
-        # Refresh canvas
-        self.beam_canvas.draw()
+        shear = self._beam_shear
+        moment = self._beam_moment
+        calculate_beam_diagrams(beam_type, length, load, x, shear, moment)
+        
+        old_limits = (self.sfd_ax.get_xlim(), self.sfd_ax.get_ylim(),
+                      self.bmd_ax.get_xlim(), self.bmd_ax.get_ylim())
+        
+        # Fix the axes from the closed-form peaks instead of autoscaling the data
+        shear_peak, moment_peak = beam_diagram_peaks(beam_type, length, load)
+        shear_limit = nice_axis_limit(1.1 * shear_peak)
+        moment_limit = nice_axis_limit(1.1 * moment_peak)
+        
+        # Update SFD
+        self._sfd_line.set_data(x, shear)
+        self.update_beam_fill(self._sfd_fill, self._sfd_fill_verts, x, shear)
+        self.sfd_ax.set_xlim(0, length)
+        self.sfd_ax.set_ylim(-shear_limit, shear_limit)
+        
+        # Update BMD
+        self._bmd_line.set_data(x, moment)
+        self.update_beam_fill(self._bmd_fill, self._bmd_fill_verts, x, moment)
+        self.bmd_ax.set_xlim(0, length)
+        self.bmd_ax.set_ylim(-moment_limit, moment_limit)
+        
+        new_limits = (self.sfd_ax.get_xlim(), self.sfd_ax.get_ylim(),
+                      self.bmd_ax.get_xlim(), self.bmd_ax.get_ylim())
+        
+        if self._beam_background is None or new_limits != old_limits:
+            # Axes changed, so the background must be redrawn; draw_idle coalesces requests
+            self.beam_canvas.draw_idle()
+        else:
+            # Only the curves changed: restore the cached background and blit them
+            self.beam_canvas.restore_region(self._beam_background)
+            self.draw_beam_curves()
+            self.beam_canvas.blit(self.beam_fig.bbox)
     
     def send_chat_message(self):
         """Send chat message to AI assistant"""
@@ -813,12 +1204,30 @@ class PlannifyProAI:
         # Clear input
         self.chat_input_var.set("")
         
-        # Generate AI response
-        response = self.generate_ai_response(message)
-        self.add_chat_message(response, "ai")
+        # Generate AI response off the main thread; a single worker keeps replies in order
+        if self._chat_worker is None:
+            self._chat_worker = threading.Thread(target=self.run_chat_worker, daemon=True)
+            self._chat_worker.start()
+        self._chat_requests.put(message)
+    
+    def run_chat_worker(self):
+        """Answer queued chat messages in order (runs on a worker thread)"""
+        while True:
+            message = self._chat_requests.get()
+            try:
+                response = self.generate_ai_response(message)
+            except Exception as e:
+                # Answer with the failure instead of letting it end the worker
+                response = f"Sorry, I couldn't answer that: {e}"
+                self.root.after(0, self.status_var.set, "AI response failed")
+            
+            # Tk widgets may only be updated from the main thread
+            self.root.after(0, self.add_chat_message, response, "ai")
     
     def add_chat_message(self, message, sender):
         """Add message to chat display"""
+        # Only follow new messages if the view was already pinned to the bottom
+        at_bottom = self.chat_text.yview()[1] >= 0.999
         self.chat_text.configure(state=tk.NORMAL)
         
         if sender == "user":
@@ -828,98 +1237,37 @@ class PlannifyProAI:
             self.chat_text.insert(tk.END, "AI Assistant: ", "ai_label")
             self.chat_text.insert(tk.END, f"{message}\n\n", "ai_message")
         
-        # Configure text tags for styling
-        self.chat_text.tag_configure("user_label", foreground="blue", font=('Arial', 10, 'bold'))
-        self.chat_text.tag_configure("ai_label", foreground="green", font=('Arial', 10, 'bold'))
-        self.chat_text.tag_configure("user_message", font=('Arial', 10))
-        self.chat_text.tag_configure("ai_message", font=('Arial', 10))
+        # Trim history from the top once it exceeds the cap
+        line_count = int(self.chat_text.index('end-1c').split('.')[0])
+        if line_count > _CHAT_MAX_LINES:
+            self.chat_text.delete('1.0', f'{line_count - _CHAT_MAX_LINES}.0')
         
         self.chat_text.configure(state=tk.DISABLED)
-        self.chat_text.see(tk.END)
+        if at_bottom or sender == "user":
+            self.chat_text.see(tk.END)
     
     def generate_ai_response(self, user_message):
         """Generate AI response based on user input"""
-        message = user_message.lower()
-        
-        # Simple keyword-based responses
-        if any(word in message for word in ['beam', 'span']):
-            return """For beam design, consider these guidelines:
-• For residential spans (8-15 ft): Use 9" × 12" beam
-• Depth = L/12 to L/15 for simply supported beams
-• Steel: 2-12mm bars top + 2-12mm bars bottom minimum
-• Stirrups: 8mm @ 150mm c/c as per IS 456:2000
-• For spans over 15ft: Consider deeper sections or intermediate supports"""
-        
-        elif 'column' in message:
-            return """Column design guidelines:
-• For loads up to 500kN: Use 12" × 12" column
-• Steel: 4-16mm dia bars minimum (0.8% steel)
-• Ties: 8mm @ 150mm c/c (IS 456:2000)
-• Concrete: M20 or M25 grade
-• Clear cover: 40mm for columns
-• Slenderness ratio should not exceed 60"""
+        tokens = set(_TOKEN_RE.findall(user_message.lower()))
         
-        elif 'slab' in message:
-            return """Slab design specifications:
-• One-way slab: L/28 to L/35 thickness
-• Two-way slab: L/32 to L/40 thickness
-• Minimum thickness: 125mm (5 inches)
-• Steel: 10mm @ 150mm c/c both directions
-• Clear cover: 20mm for slabs
-• Concrete: M20 grade minimum"""
-        
-        elif 'foundation' in message:
-            return """Foundation design considerations:
-• Depth: Minimum 1.5m below ground level
-• Size: Based on soil bearing capacity (typically 10-20 T/m²)
-• For residential: 4' × 4' isolated footings
-• Steel: 12mm bars @ 150mm c/c both ways
-• Concrete: M20 grade
-• Always conduct soil test first!"""
-        
-        elif any(word in message for word in ['cost', 'rate', 'price']):
-            return """Current construction cost estimates (₹/sq ft):
-• Basic construction: ₹1200-1500/sq ft
-• Good quality: ₹1500-2000/sq ft
-• Premium construction: ₹2000-3000/sq ft
-• Material cost: 60-65% of total
-• Labor cost: 25-30% of total
-• Other expenses: 10-15% of total
-Note: Rates vary by location and current market prices."""
-        
-        elif any(word in message for word in ['is code', 'standard', 'code']):
-            return """Important Indian Standards (IS Codes):
-• IS 456:2000 - RCC Design Code
-• IS 875:1987 - Design Loads (Dead, Live, Wind)
-• IS 1893:2016 - Seismic Design
-• IS 1904:1986 - Foundation Design
-• IS 2502:1963 - Bar Bending Schedule
-• IS 10262:2019 - Concrete Mix Design
-Always refer to latest versions!"""
+        # Fold inflected forms ("beams", "loading", "priced") onto the base keywords
+        for token in list(tokens):
+            tokens.update(word_stems(token))
         
-        elif 'load' in message:
-            return """Load calculations as per IS 875:
-• Dead Load: RCC = 25 kN/m³, Brick = 20 kN/m³
-• Live Load: Residential = 2 kN/m², Commercial = 3-5 kN/m²
-• Floor finish load = 1 kN/m²
-• Wall load = Height × thickness × 20 kN/m³
-• Total load = 1.5×DL + 1.5×LL (load factors)
-• Wind load: As per IS 875 Part-3"""
+        # Simple keyword-based responses
+        for keywords, response in _KEYWORD_TABLE:
+            if keywords & tokens:
+                return response
         
         # Default response
-        return """I can help you with structural engineering questions including:
-• Beam and column design
-• Load calculations
-• Foundation sizing
-• IS Code references
-• Material specifications
-• Cost estimation
-• Reinforcement details
-
-Please ask a specific question about any of these topics!"""
+        return _RESP_DEFAULT
     
     def download_floor_plan(self):
         """Download floor plan as image"""
+        if self._export_busy:
+            self.status_var.set("Floor plan export already in progress")
+            return
+        
         try:
             # Ask user for save location
             filename = filedialog.asksaveasfilename(
@@ -928,46 +1276,154 @@ Please ask a specific question about any of these topics!"""
             )
             
             if filename:
-                # Create image from canvas
+                # Snapshot the canvas here; only the main thread may touch Tk
                 canvas_ps = self.floor_plan_canvas.postscript(colormode='color')
                 
-                # Convert to image using PIL (Note: This is a simplified approach)
-                # In practice, you might want to use a more robust method
-                messagebox.showinfo("Export", f"Floor plan export initiated.\nFile: {filename}")
-                self.status_var.set("Floor plan exported successfully")
+                # Convert and write on a worker thread so the GUI keeps responding
+                self._export_busy = True
+                self.status_var.set("Exporting floor plan...")
+                threading.Thread(target=self.export_floor_plan_image,
+                                 args=(canvas_ps, filename), daemon=True).start()
                 
         except Exception as e:
             messagebox.showerror("Error", f"Export failed: {str(e)}")
     
+    def export_floor_plan_image(self, canvas_ps, filename):
+        """Convert a PostScript snapshot to an image file (runs on a worker thread)"""
+        try:
+            from PIL import Image
+            
+            # Rasterizing EPS needs Ghostscript; PIL raises if it's unavailable
+            with Image.open(io.BytesIO(canvas_ps.encode('utf-8'))) as image:
+                image.save(filename)
+        except Exception as e:
+            self.root.after(0, self.finish_floor_plan_export, filename, str(e))
+        else:
+            self.root.after(0, self.finish_floor_plan_export, filename, None)
+    
+    def finish_floor_plan_export(self, filename, error):
+        """Report the result of a background export on the main thread"""
+        self._export_busy = False
+        
+        if error is not None:
+            messagebox.showerror("Error", f"Export failed: {error}")
+            self.status_var.set("Floor plan export failed")
+            return
+        
+        messagebox.showinfo("Export", f"Floor plan exported.\nFile: {filename}")
+        self.status_var.set("Floor plan exported successfully")
+    
     def run(self):
         """Start the application"""
         self.root.mainloop()
 
 
 # Utility functions
+# Conversion constants, folded once at import; the helpers below also accept NumPy arrays
+_M_PER_FT = 0.3048
+_SQ_M_PER_SQ_FT = 0.092903
+_CU_M_PER_CU_FT = 0.0283168
+_CU_M_PER_SQ_FT_PER_IN = _CU_M_PER_CU_FT / 12.0  # 1 sq ft slab, 1 inch thick
+_STEEL_KG_PER_M_PER_MM2 = 0.00617  # kg/m for steel bars, per mm² of diameter
+
 def format_currency(amount):
     """Format number to Indian currency format"""
+    if isinstance(amount, np.ndarray):
+        # Round all values in one pass, then format plain Python ints
+        rupees = np.rint(amount).astype(np.int64)
+        # dtype=str keeps empty inputs as string arrays too
+        return np.array([f"₹{value:,}" for value in rupees.ravel().tolist()], dtype=str).reshape(amount.shape)
     return f"₹{amount:,.0f}"
 
 def feet_to_meters(feet):
     """Convert feet to meters"""
-    return feet * 0.3048
+    return feet * _M_PER_FT
 
 def sq_feet_to_sq_meters(sq_feet):
     """Convert square feet to square meters"""
-    return sq_feet * 0.092903
+    return sq_feet * _SQ_M_PER_SQ_FT
 
 def calculate_concrete_volume(area, thickness):
     """Calculate concrete volume for given area and thickness"""
-    # area in sq ft, thickness in inches
-    volume_cubic_feet = area * (thickness / 12)
-    return volume_cubic_feet * 0.0283168  # Convert to cubic meters
+    # area in sq ft, thickness in inches; result in cubic meters
+    return area * thickness * _CU_M_PER_SQ_FT_PER_IN
 
 def calculate_steel_weight(diameter, length):
     """Calculate steel weight for reinforcement"""
     # diameter in mm, length in meters
-    weight_per_meter = (diameter * diameter * 0.00617)  # kg/m for steel bars
-    return weight_per_meter * length
+    return _STEEL_KG_PER_M_PER_MM2 * diameter * diameter * length
+
+
+# Beam analysis helpers
+def calculate_beam_diagrams(beam_type, length, load, x, shear, moment):
+    """Fill shear and moment with the beam's diagrams sampled at x, without temporaries"""
+    if beam_type == "simply_supported":
+        # Shear force (triangular): w (L/2 - x)
+        np.subtract(length * 0.5, x, out=shear)
+        shear *= load
+        
+        # Bending moment (parabolic): w x (L - x) / 2
+        np.subtract(length, x, out=moment)
+        moment *= x
+        moment *= 0.5 * load
+        
+    elif beam_type == "cantilever":
+        # Bending moment (parabolic): -w (L - x)^2 / 2
+        np.subtract(length, x, out=shear)
+        np.multiply(shear, shear, out=moment)
+        moment *= -0.5 * load
+        
+        # Shear force (linear): -w (L - x)
+        shear *= -load
+        
+    elif beam_type == "fixed_both":
+        # Simplified - actual would need more complex analysis
+        np.subtract(length * 0.5, x, out=shear)
+        shear *= load
+        
+        np.multiply(x, x, out=moment)
+        np.subtract(length * length, moment, out=moment)
+        moment *= x
+        moment *= load / 12.0
+        
+    else:
+        raise ValueError(f"Unknown beam type: {beam_type}")
+
+def beam_diagram_peaks(beam_type, length, load):
+    """Return the largest absolute shear and moment of the curves from calculate_beam_diagrams"""
+    if beam_type == "simply_supported":
+        return load * length * 0.5, load * length * length / 8.0
+    elif beam_type == "cantilever":
+        return load * length, load * length * length * 0.5
+    elif beam_type == "fixed_both":
+        # w x (L^2 - x^2) / 12 peaks at x = L / sqrt(3)
+        return load * length * 0.5, load * length ** 3 / (18.0 * math.sqrt(3.0))
+    else:
+        raise ValueError(f"Unknown beam type: {beam_type}")
+
+# Axis limit steps within a decade; fine enough that curves keep most of the plot height
+_AXIS_LIMIT_STEPS = (1.0, 1.2, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 8.0)
+
+def nice_axis_limit(value):
+    """Round value up to the next axis step so nearby inputs share axis limits"""
+    decade = 10.0 ** math.floor(math.log10(value))
+    for multiple in _AXIS_LIMIT_STEPS:
+        if value <= multiple * decade:
+            return multiple * decade
+    return 10.0 * decade
+
+
+# Chat helpers
+def word_stems(word):
+    """Return candidate base forms of a word ending in -ing, -ed or -s"""
+    for suffix in ('ing', 'ed', 's'):
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            stem = word[:-len(suffix)]
+            stems = [stem, stem + 'e']  # "pricing" -> "price"
+            if stem[-1] == stem[-2]:
+                stems.append(stem[:-1])  # "spanning" -> "span"
+            return stems
+    return []
 
 
 # Main execution